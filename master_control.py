@@ -4,8 +4,13 @@ import subprocess
 import sys
 import os
 import time
-import json
+import random
+import orjson
 import logging
+import atexit
+import signal
+import threading
+from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 
 # ============================================================================
@@ -15,6 +20,7 @@ from datetime import datetime, timedelta
 SPREADSHEET_NAME = "Lead Gen Engine"
 MAX_RETRIES = 3
 RETRY_DELAY = 10
+BACKOFF_JITTER = 0.5  # Up to +50% so retries don't line up with the processor's
 
 # Hunter settings
 HUNTER_TIMEOUT = 1800  # 30 minutes
@@ -23,6 +29,7 @@ HUNTER_TIMEOUT = 1800  # 30 minutes
 LOOP_DELAY = 60  # Check every 60 seconds
 CAMPAIGN_SUCCESS_DELAY = 1800  # 30 minutes between successful campaigns
 CAMPAIGN_FAILURE_DELAY = 300  # 5 minutes retry on failure
+WAKE_CHECK_INTERVAL = 60  # Re-check the clock this often during long waits
 
 # Daily limits
 MAX_CAMPAIGNS_PER_DAY = 5  # Adjust as needed
@@ -42,67 +49,116 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# ============================================================================
+# SHUTDOWN HANDLING
+# ============================================================================
+
+shutdown_event = threading.Event()
+
+def wait(seconds):
+    """Sleep that returns early (True) once shutdown has been requested"""
+    return shutdown_event.wait(seconds)
+
+def wait_until(deadline):
+    """Wait for a wall-clock time, re-checking the clock every WAKE_CHECK_INTERVAL
+    so suspend/resume or clock changes can't make it wake at the wrong time"""
+    while (remaining := (deadline - datetime.now()).total_seconds()) > 0:
+        if wait(min(WAKE_CHECK_INTERVAL, remaining)):
+            return True
+    return False
+
 # ============================================================================
 # CAMPAIGN TRACKING FUNCTIONS
 # ============================================================================
 
+@dataclass
+class CampaignLog:
+    """Daily campaign counter, kept in memory and written on change"""
+    date: str = ""
+    processed_count: int = 0
+
+_last_saved_log = None  # Bytes last written, so unchanged saves skip the disk
+
 def load_campaign_log():
     """Load daily campaign counter from file"""
+    global _last_saved_log
     if os.path.exists(CAMPAIGN_TRACKING_FILE):
         try:
-            with open(CAMPAIGN_TRACKING_FILE, 'r') as f:
-                return json.load(f)
+            with open(CAMPAIGN_TRACKING_FILE, 'rb') as f:
+                _last_saved_log = f.read()
+            data = orjson.loads(_last_saved_log)
+            return CampaignLog(date=data.get("date", ""),
+                               processed_count=data.get("processed_count", 0))
         except:
-            return {"date": "", "processed_count": 0}
-    return {"date": "", "processed_count": 0}
+            return CampaignLog()
+    return CampaignLog()
+
+def save_campaign_log(log_data):
+    """Save campaign counter to file"""
+    global _last_saved_log
+    data = orjson.dumps(asdict(log_data))
+    if data == _last_saved_log:
+        return
+    # Temp file + os.replace: a crash mid-write can't truncate the log
+    tmp_path = f"{CAMPAIGN_TRACKING_FILE}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, CAMPAIGN_TRACKING_FILE)
+    _last_saved_log = data
 
 def reset_if_new_day(log_data):
     """Reset counter if it's a new day"""
     today = datetime.now().strftime("%Y-%m-%d")
-    if log_data["date"] != today:
+    if log_data.date != today:
         logger.info(f"🌅 New day! Resetting campaign counter.")
-        log_data["date"] = today
-        log_data["processed_count"] = 0
+        log_data.date = today
+        log_data.processed_count = 0
+        save_campaign_log(log_data)
     return log_data
 
-def save_campaign_log(log_data):
-    """Save campaign counter to file"""
-    with open(CAMPAIGN_TRACKING_FILE, 'w') as f:
-        json.dump(log_data, f)
+campaign_log = load_campaign_log()
+atexit.register(lambda: save_campaign_log(campaign_log))
 
 def check_daily_limit():
     """Check if daily campaign limit reached"""
-    campaign_log = load_campaign_log()
-    campaign_log = reset_if_new_day(campaign_log)
+    reset_if_new_day(campaign_log)
     
-    if campaign_log["processed_count"] >= MAX_CAMPAIGNS_PER_DAY:
-        logger.info(f"🎯 Daily limit reached: {campaign_log['processed_count']}/{MAX_CAMPAIGNS_PER_DAY} campaigns")
+    if campaign_log.processed_count >= MAX_CAMPAIGNS_PER_DAY:
+        logger.info(f"🎯 Daily limit reached: {campaign_log.processed_count}/{MAX_CAMPAIGNS_PER_DAY} campaigns")
         
-        # Calculate sleep time until tomorrow
+        # Sleep until just after midnight
         now = datetime.now()
         tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=1, second=0)
-        sleep_seconds = (tomorrow - now).total_seconds()
         
         logger.info(f"😴 Sleeping until {tomorrow.strftime('%Y-%m-%d %H:%M:%S')}")
-        time.sleep(sleep_seconds)
+        wait_until(tomorrow)
         return False
     
     return True
 
 def increment_campaign_count():
     """Increment today's campaign counter"""
-    campaign_log = load_campaign_log()
-    campaign_log = reset_if_new_day(campaign_log)
-    campaign_log["processed_count"] += 1
+    reset_if_new_day(campaign_log)
+    campaign_log.processed_count += 1
     save_campaign_log(campaign_log)
-    logger.info(f"📊 Daily progress: {campaign_log['processed_count']}/{MAX_CAMPAIGNS_PER_DAY} campaigns")
+    logger.info(f"📊 Daily progress: {campaign_log.processed_count}/{MAX_CAMPAIGNS_PER_DAY} campaigns")
 
 # ============================================================================
 # GOOGLE SHEETS CONNECTION
 # ============================================================================
 
+_sheets_connection = None  # (spreadsheet, campaigns_worksheet), reused across cycles
+
+def jittered(seconds):
+    """Spread a backoff wait so processes sharing the Sheets quota don't retry in lockstep"""
+    return seconds * (1 + random.uniform(0, BACKOFF_JITTER))
+
 def connect_to_sheets(retry_count=0):
     """Connect to Google Sheets with exponential backoff retry"""
+    global _sheets_connection
+    if _sheets_connection is not None:
+        return _sheets_connection
+    
     try:
         script_dir = os.path.dirname(os.path.abspath(__file__))
         creds_path = os.path.join(script_dir, 'gspread_credentials.json')
@@ -111,18 +167,19 @@ def connect_to_sheets(retry_count=0):
             logger.error(f"❌ Credentials file not found: {creds_path}")
             return None, None
         
-        gc = gspread.service_account(filename=creds_path)
+        gc = gspread.service_account(filename=creds_path, http_client=gspread.BackOffHTTPClient)
         spreadsheet = gc.open(SPREADSHEET_NAME)
         campaigns_worksheet = spreadsheet.worksheet("CAMPAIGNS")
         
         logger.info("✅ Connected to Google Sheets")
-        return spreadsheet, campaigns_worksheet
+        _sheets_connection = (spreadsheet, campaigns_worksheet)
+        return _sheets_connection
         
     except gspread.exceptions.APIError as e:
         logger.error(f"⚠️ Google Sheets API Error: {e}")
         if retry_count < MAX_RETRIES:
-            wait_time = RETRY_DELAY * (2 ** retry_count)
-            logger.info(f"🔄 Retrying in {wait_time}s... (Attempt {retry_count + 1}/{MAX_RETRIES})")
+            wait_time = jittered(RETRY_DELAY * (2 ** retry_count))
+            logger.info(f"🔄 Retrying in {wait_time:.1f}s... (Attempt {retry_count + 1}/{MAX_RETRIES})")
             time.sleep(wait_time)
             return connect_to_sheets(retry_count + 1)
         return None, None
@@ -251,8 +308,8 @@ def update_campaign_status(campaigns_worksheet, row, status):
             return True
         except gspread.exceptions.APIError as e:
             if '429' in str(e):
-                wait_time = (2 ** attempt) * 5
-                logger.warning(f"⚠️ Rate limit hit, waiting {wait_time}s...")
+                wait_time = jittered((2 ** attempt) * 5)
+                logger.warning(f"⚠️ Rate limit hit, waiting {wait_time:.1f}s...")
                 time.sleep(wait_time)
             else:
                 logger.error(f"❌ Error updating status: {e}")
@@ -329,7 +386,7 @@ def process_campaign():
         increment_campaign_count()
         
         logger.info(f"😴 Waiting {CAMPAIGN_SUCCESS_DELAY // 60} minutes before next campaign...")
-        time.sleep(CAMPAIGN_SUCCESS_DELAY)
+        wait(CAMPAIGN_SUCCESS_DELAY)
     else:
         status = f"Error - {message}"
         logger.error(f"💥 Campaign '{campaign_query}' failed: {message}")
@@ -337,7 +394,7 @@ def process_campaign():
         update_campaign_status(campaigns_worksheet, campaign_row, status)
         
         logger.info(f"⏳ Retrying in {CAMPAIGN_FAILURE_DELAY // 60} minutes...")
-        time.sleep(CAMPAIGN_FAILURE_DELAY)
+        wait(CAMPAIGN_FAILURE_DELAY)
     
     logger.info("=" * 70)
     logger.info("✅ Cycle complete")
@@ -357,10 +414,10 @@ def main_loop():
     logger.info(f"⚙️  Daily campaign limit: {MAX_CAMPAIGNS_PER_DAY}")
     logger.info(f"⏱️  Delay between campaigns: {CAMPAIGN_SUCCESS_DELAY // 60} minutes")
     
-    while True:
+    while not shutdown_event.is_set():
         try:
             process_campaign()
-            time.sleep(LOOP_DELAY)
+            wait(LOOP_DELAY)
             
         except KeyboardInterrupt:
             logger.info("\n⛔ Interrupted by user")
@@ -369,13 +426,19 @@ def main_loop():
         except Exception as e:
             logger.critical(f"💀 Critical error in main loop: {e}", exc_info=True)
             logger.info(f"🔄 Restarting in {LOOP_DELAY}s...")
-            time.sleep(LOOP_DELAY)
+            wait(LOOP_DELAY)
+    
+    if shutdown_event.is_set():
+        logger.info("🛑 Shutdown requested - Master Control stopped")
 
 # ============================================================================
 # ENTRY POINT
 # ============================================================================
 
 if __name__ == "__main__":
+    # SIGTERM ends the current wait and lets the loop exit normally
+    signal.signal(signal.SIGTERM, lambda signum, frame: shutdown_event.set())
+    
     try:
         main_loop()
     except KeyboardInterrupt:
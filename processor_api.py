@@ -1,17 +1,26 @@
-from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 import gspread
 import os
 import time
 import random
-import json
+import orjson
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
 import re
 import requests
 from typing import Dict, Any, Optional, List, Tuple
 from enum import Enum
 from dataclasses import dataclass
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from functools import partial, lru_cache
 import unicodedata
+import asyncio
+import threading
+import signal
+import hashlib
+import zlib
+import sqlite3
 
 # ============================================================================
 # 🔥 CONFIGURATION
@@ -19,7 +28,10 @@ import unicodedata
 OLLAMA_URL = "http://localhost:11434/api/generate"
 OLLAMA_MODEL = "llama3.2:3b"
 SPREADSHEET_NAME = "Lead Gen Engine"
-SHEET_UPDATE_DELAY = 3
+SHEETS_WRITES_PER_MINUTE = 55  # 60/min per-user quota minus headroom for the hunter + master control
+SHEETS_WRITE_BURST = 10
+SHEETS_READS_PER_MINUTE = 55  # 60/min per-user quota minus headroom
+SHEETS_READ_BURST = 10
 MAX_LEADS_PER_DAY = 50
 MIN_DELAY_SECONDS = 15
 MAX_DELAY_SECONDS = 45
@@ -29,20 +41,48 @@ REST_DURATION = 300
 
 # Files
 TRACKING_FILE = "daily_processing_log.json"
-CACHE_FILE = "sheets_cache.json"
 SUPERVISOR_LOG_FILE = "supervisor_decisions.jsonl"
 DUPLICATE_REGISTRY_FILE = "duplicate_registry.json"
 PHONE_SYNC_LOG_FILE = "phone_sync_log.json"
 PROGRESS_FILE = "progress_tracker.json"
 HEALTH_CHECK_FILE = "system_health.json"
+RESPONSE_CACHE_FILE = "ollama_cache.db"
+PAGE_STORE_FILE = "page_store.db"
 
 # Limits
 CACHE_DURATION = 300
+SHEETS_CACHE_MAX_ENTRIES = 32
 MAX_RETRIES = 5
 BASE_BACKOFF = 10
+BACKOFF_GROWTH = 1.3  # 10, 13, 17, 22, 28s - stays inside one 100s quota window
+BACKOFF_JITTER = 0.5  # Up to +50% so parallel retries don't wake together
+MAX_BACKOFF = 30
+CIRCUIT_FAILURE_THRESHOLD = 3  # Calls that exhaust their retries within the window open the Sheets circuit
+CIRCUIT_FAILURE_WINDOW = 600  # One exhausted call alone spends ~1 min in backoff
+CIRCUIT_COOLDOWN = 120
+MAX_RETRY_AFTER = 60  # Clamp server-requested delays so a retry loop stalls < 5 minutes total
+BATCH_UPDATE_CHUNK = 500  # Requests per batchUpdate call (keeps payloads under the size limit)
+OLLAMA_MAX_RETRIES = 3
+OLLAMA_RETRY_BACKOFF = 5
 MAX_HTML_LENGTH = 8000
 MIN_HTML_LENGTH = 500
 
+# Scraping
+SCRAPE_CONCURRENCY = 3
+PAGE_LOAD_TIMEOUT_MS = 30000
+PAGE_SETTLE_TIMEOUT_MS = 5000
+SCRAPE_TIMEOUT = 120  # Hard ceiling on one scrape, including the wait for a free browser slot
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+STATIC_FETCH_TIMEOUT = 15
+SCRAPER_USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                      "(KHTML, like Gecko) Chrome/124.0 Safari/537.36")
+SPA_MARKERS = ("__NEXT_DATA__", "ng-version", "data-reactroot", "window.__NUXT__",
+               '<div id="root"></div>', '<div id="app"></div>')
+PAGE_STORE_TTL = 7 * 24 * 3600  # Reuse a scraped page for a week
+CLEANER_VERSION = "v3"  # Bump when clean_html_aggressive's output changes to invalidate stored pages
+CACHE_COMPRESSION_LEVEL = 6  # zlib level for cached pages and responses
+PROMPT_VERSION = "v3"  # Bump when the analysis prompt changes to invalidate cached responses
+
 # ============================================================================
 # 📊 CORE TYPES
 # ============================================================================
@@ -114,39 +154,69 @@ class SupervisorLogger:
         print(f"{icon} [{supervisor}:{phase}] {details}")
         
         try:
-            with open(SUPERVISOR_LOG_FILE, 'a') as f:
-                f.write(json.dumps(log_entry) + '\n')
+            with open(SUPERVISOR_LOG_FILE, 'ab') as f:
+                f.write(orjson.dumps(log_entry) + b'\n')
         except Exception as e:
             print(f"⚠️  Log write failed: {e}")
 
 LOGGER = SupervisorLogger()
 
+# Set by SIGTERM; every long wait below returns early once it is set
+SHUTDOWN = threading.Event()
+
 # ============================================================================
 # 🤖 OLLAMA FUNCTIONS
 # ============================================================================
-def ask_ollama(prompt, max_tokens=800, temperature=0.3):
-    """Call Ollama API"""
+OLLAMA_SESSION = requests.Session()  # Keep-alive connection reused across calls
+
+def ask_ollama(prompt, max_tokens=800, temperature=0.3, json_mode=False, system=None):
+    """Call Ollama API (streamed, so the timeout applies per chunk)"""
+    payload = {
+        "model": OLLAMA_MODEL,
+        "prompt": prompt,
+        "stream": True,
+        "options": {
+            "num_predict": max_tokens,
+            "temperature": temperature,
+            "top_p": 0.9,
+            "top_k": 40,
+        }
+    }
+    if json_mode:
+        payload["format"] = "json"
+    if system:
+        payload["system"] = system
+    
     try:
-        response = requests.post(
+        response = OLLAMA_SESSION.post(
             OLLAMA_URL,
-            json={
-                "model": OLLAMA_MODEL,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "num_predict": max_tokens,
-                    "temperature": temperature,
-                    "top_p": 0.9,
-                    "top_k": 40,
-                }
-            },
+            json=payload,
+            stream=True,
             timeout=120
         )
-        if response.status_code == 200:
-            result = response.json()
-            return result['response']
-        else:
-            raise Exception(f"Ollama HTTP {response.status_code}")
+        with response:
+            if response.status_code != 200:
+                raise Exception(f"Ollama HTTP {response.status_code}")
+            
+            chunks = []
+            final_chunk = None
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = orjson.loads(line)
+                # Model errors arrive mid-stream with HTTP 200
+                if chunk.get('error'):
+                    raise Exception(chunk['error'])
+                chunks.append(chunk.get('response', ''))
+                if chunk.get('done'):
+                    final_chunk = chunk
+                    break
+            
+            if final_chunk is None:
+                raise Exception("stream ended before completion")
+            if json_mode and final_chunk.get('done_reason') == 'length':
+                raise Exception(f"JSON response cut off at {max_tokens} tokens")
+            return ''.join(chunks)
     except requests.exceptions.Timeout:
         raise Exception("Ollama timeout")
     except requests.exceptions.ConnectionError:
@@ -154,6 +224,54 @@ def ask_ollama(prompt, max_tokens=800, temperature=0.3):
     except Exception as e:
         raise Exception(f"Ollama error: {str(e)}")
 
+def is_cacheable_response(response: str, json_mode: bool, validate=None) -> bool:
+    """Only keep replies worth reusing - a bad entry would be served on every rerun"""
+    if not response or not response.strip():
+        return False
+    if validate is not None:
+        return bool(validate(response))
+    if json_mode:
+        try:
+            orjson.loads(response)
+        except orjson.JSONDecodeError:
+            return False
+    return True
+
+def ask_ollama_cached(prompt, max_tokens=800, temperature=0.3, json_mode=False, system=None,
+                      validate=None):
+    """Call Ollama, reusing a cached response for an identical prompt.
+    
+    `validate` decides whether a reply is usable; unusable replies are retried
+    and never cached, the last one is returned as-is for the caller's fallback.
+    """
+    key = response_cache.make_key(f"{system or ''}|{prompt}")
+    cached = response_cache.get(key)
+    if cached is not None and is_cacheable_response(cached, json_mode, validate):
+        LOGGER.log("ResponseCache", "hit", TaskStatus.SUCCESS, "Reusing cached AI response")
+        return cached
+    
+    for attempt in range(OLLAMA_MAX_RETRIES):
+        try:
+            response = ask_ollama(prompt, max_tokens=max_tokens, temperature=temperature,
+                                  json_mode=json_mode, system=system)
+            if is_cacheable_response(response, json_mode, validate):
+                response_cache.set(key, response)
+                return response
+            error = "Empty or unusable AI response"
+        except Exception as e:
+            if attempt == OLLAMA_MAX_RETRIES - 1:
+                raise
+            error = e
+        
+        if attempt == OLLAMA_MAX_RETRIES - 1:
+            LOGGER.log("ResponseCache", "skip", TaskStatus.FAILED,
+                       f"{error}; returning it uncached")
+            return response
+        wait_time = (2 ** attempt) * OLLAMA_RETRY_BACKOFF
+        LOGGER.log("Ollama", "retry", TaskStatus.RETRY_NEEDED,
+                   f"{error}. Retrying in {wait_time}s")
+        time.sleep(wait_time)
+
 def verify_ollama():
     """Verify Ollama is running"""
     try:
@@ -174,63 +292,168 @@ def verify_ollama():
 # ============================================================================
 # 🗄️ CACHING LAYER
 # ============================================================================
+def write_file_atomic(path: str, data: bytes):
+    """Write via a temp file + os.replace so a crash never leaves a truncated file"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
 class SheetsCache:
-    def __init__(self):
-        self.cache = self.load_cache()
+    """Bounded in-memory LRU of sheet reads.
     
-    def load_cache(self):
-        if os.path.exists(CACHE_FILE):
-            try:
-                with open(CACHE_FILE, 'r') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
+    Entries expire after CACHE_DURATION, so there is nothing worth keeping
+    across restarts - it is never written to disk.
+    """
     
-    def save_cache(self):
-        with open(CACHE_FILE, 'w') as f:
-            json.dump(self.cache, f)
+    def __init__(self, max_entries=SHEETS_CACHE_MAX_ENTRIES):
+        self.cache = OrderedDict()
+        self.max_entries = max_entries
     
     def get(self, key):
-        if key in self.cache:
-            cached_data = self.cache[key]
-            if time.time() - cached_data['timestamp'] < CACHE_DURATION:
-                return cached_data['data']
-        return None
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry['timestamp'] >= CACHE_DURATION:
+            del self.cache[key]
+            return None
+        self.cache.move_to_end(key)
+        return entry['data']
     
-    def set(self, key, data):
-        self.cache[key] = {'data': data, 'timestamp': time.time()}
-        self.save_cache()
+    def set(self, key, data, deps=()):
+        self.cache[key] = {'data': data, 'timestamp': time.time(), 'deps': set(deps)}
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+    
+    def invalidate(self, *deps):
+        """Drop only the entries that depend on one of the given worksheets"""
+        stale = [key for key, entry in self.cache.items() if entry['deps'] & set(deps)]
+        for key in stale:
+            del self.cache[key]
 
 cache = SheetsCache()
+RESULTS_RECORDS_KEY = "results_records"
+RESULTS_NAME_INDEX_KEY = "results_name_index"
+LEADS_DEP = "worksheet:LEADS"
+RESULTS_DEP = "worksheet:RESULTS"
+
+def compress_text(text: str) -> bytes:
+    """Compress cached text into a BLOB"""
+    return zlib.compress(text.encode('utf-8'), CACHE_COMPRESSION_LEVEL)
+
+def decompress_text(value) -> str:
+    """Inverse of compress_text; rows written before compression are plain TEXT"""
+    if isinstance(value, str):
+        return value
+    return zlib.decompress(value).decode('utf-8')
+
+class ResponseCache:
+    """Local SQLite cache of Ollama responses keyed by prompt hash"""
+    
+    def __init__(self, path=RESPONSE_CACHE_FILE):
+        self.db = sqlite3.connect(path)
+        self.db.execute('CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT)')
+        # Pages used to share this file; they now live in PAGE_STORE_FILE
+        self.db.execute('DROP TABLE IF EXISTS pages')
+        self.db.execute('DROP TABLE IF EXISTS contents')
+        self.db.commit()
+    
+    def make_key(self, prompt: str) -> str:
+        return hashlib.sha256(f"{PROMPT_VERSION}|{OLLAMA_MODEL}|{prompt}".encode('utf-8')).hexdigest()
+    
+    def get(self, key):
+        row = self.db.execute('SELECT response FROM responses WHERE key = ?', (key,)).fetchone()
+        return decompress_text(row[0]) if row else None
+    
+    def set(self, key, response):
+        self.db.execute('INSERT OR REPLACE INTO responses VALUES (?, ?)', (key, compress_text(response)))
+        self.db.commit()
+
+response_cache = ResponseCache()
+
+class PageStore:
+    """Content-addressed store of cleaned page content.
+    
+    Chain branches often share one website URL, so a page scraped for one
+    lead is reused for the others instead of loading it again.
+    """
+    
+    def __init__(self, path=PAGE_STORE_FILE):
+        self.db = sqlite3.connect(path)
+        self.db.execute('CREATE TABLE IF NOT EXISTS pages (url TEXT PRIMARY KEY, sha TEXT, fetched_at REAL)')
+        self.db.execute('CREATE TABLE IF NOT EXISTS contents (sha TEXT PRIMARY KEY, content TEXT)')
+        self.prune()
+    
+    def prune(self):
+        """Drop pages from older cleaner versions or past their TTL, then orphaned contents"""
+        self.db.execute('DELETE FROM pages WHERE url NOT LIKE ? OR fetched_at <= ?',
+                        (f"{CLEANER_VERSION}|%", time.time() - PAGE_STORE_TTL))
+        self.db.execute('DELETE FROM contents WHERE sha NOT IN (SELECT sha FROM pages)')
+        self.db.commit()
+    
+    @staticmethod
+    def make_key(url: str) -> str:
+        return f"{CLEANER_VERSION}|{url}"
+    
+    def get(self, url: str) -> Optional[str]:
+        row = self.db.execute(
+            'SELECT contents.content FROM pages JOIN contents ON pages.sha = contents.sha '
+            'WHERE pages.url = ? AND pages.fetched_at > ?',
+            (self.make_key(url), time.time() - PAGE_STORE_TTL)
+        ).fetchone()
+        return decompress_text(row[0]) if row else None
+    
+    def put(self, url: str, content: str):
+        sha = hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+        self.db.execute('INSERT OR IGNORE INTO contents VALUES (?, ?)', (sha, compress_text(content)))
+        self.db.execute('INSERT OR REPLACE INTO pages VALUES (?, ?, ?)',
+                        (self.make_key(url), sha, time.time()))
+        self.db.commit()
+
+page_store = PageStore()
 
 # ============================================================================
 # 🧹 HTML CLEANING
 # ============================================================================
+NON_VISIBLE_BLOCK_RE = re.compile(
+    r'<(script|style|noscript|svg|template)\b.*?</\1\s*>|<!--.*?-->',
+    flags=re.IGNORECASE | re.DOTALL
+)
+TAG_RE = re.compile(r'<[^>]+>')
+REPEATED_CHAR_RE = re.compile(r'(\S)\1{3,}')
+DISALLOWED_CHAR_RE = re.compile(r'[^\w\s@.,!?;:()\-\'\"\/]')
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+PHONE_RE = re.compile(r'[\+\(]?[0-9][0-9\s\-\(\)]{8,}[0-9]')
+STRIPPED_TAGS = (
+    'script', 'style', 'noscript', 'iframe', 'svg', 'path',
+    'meta', 'link', 'head', 'footer', 'nav', 'aside',
+    'template', 'canvas', 'object', 'embed', 'picture',
+)
+
 def clean_html_aggressive(html_content):
     """Clean HTML aggressively"""
     try:
-        soup = BeautifulSoup(html_content, 'html.parser')
-        for tag in soup(['script', 'style', 'noscript', 'iframe', 'svg', 'path', 
-                         'meta', 'link', 'head', 'footer', 'nav', 'aside']):
-            tag.decompose()
+        root = lxml_html.document_fromstring(html_content)
+        
+        # Read head metadata before the head is stripped
+        title = (root.findtext('.//title') or '').strip()
+        meta_desc = root.xpath('string(//meta[@name="description"]/@content)')[:150]
         
-        text = soup.get_text(separator=' ', strip=True)
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'(\S)\1{3,}', r'\1\1', text)
-        text = re.sub(r'[^\w\s@.,!?;:()\-\'\"\/]', '', text)
+        etree.strip_elements(root, etree.Comment, *STRIPPED_TAGS, with_tail=False)
+        
+        text = ' '.join(s.strip() for s in root.itertext() if s.strip())
+        text = WHITESPACE_RE.sub(' ', text)
+        text = REPEATED_CHAR_RE.sub(r'\1\1', text)
+        text = DISALLOWED_CHAR_RE.sub('', text)
         
         structured_data = {
-            'title': soup.title.string if soup.title else '',
-            'headings': [h.get_text(strip=True) for h in soup.find_all(['h1', 'h2', 'h3'])[:8]],
-            'meta_desc': '',
+            'title': title,
+            'headings': [' '.join(h.text_content().split()) for h in root.iter('h1', 'h2', 'h3')][:8],
+            'meta_desc': meta_desc,
             'contact_info': extract_contact_info(text),
         }
         
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
-        if meta_desc and meta_desc.get('content'):
-            structured_data['meta_desc'] = meta_desc['content'][:150]
-        
         if len(text) > MAX_HTML_LENGTH:
             mid_point = MAX_HTML_LENGTH // 2
             text = text[:mid_point] + " [...] " + text[-mid_point:]
@@ -239,22 +462,25 @@ def clean_html_aggressive(html_content):
 TITLE: {structured_data['title']}
 DESC: {structured_data['meta_desc']}
 HEADINGS: {', '.join(structured_data['headings'])}
-CONTACT: {json.dumps(structured_data['contact_info'])}
+CONTACT: {orjson.dumps(structured_data['contact_info']).decode()}
 TEXT:
 {text}
 """
         return compact_html.strip()
     except Exception as e:
         LOGGER.log("HTMLCleaner", "error", TaskStatus.FAILED, f"Cleaning failed: {e}")
-        return html_content[:MAX_HTML_LENGTH]
+        # Never hand raw markup to the model - drop non-visible blocks and tags
+        text = NON_VISIBLE_BLOCK_RE.sub(' ', html_content)
+        text = TAG_RE.sub(' ', text)
+        return ' '.join(text.split())[:MAX_HTML_LENGTH]
 
 def extract_contact_info(text):
     """Extract contact info from text"""
     contact = {}
-    emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
+    emails = EMAIL_RE.findall(text)
     if emails:
         contact['emails'] = list(set(emails))[:3]
-    phones = re.findall(r'[\+\(]?[0-9][0-9\s\-\(\)]{8,}[0-9]', text)
+    phones = PHONE_RE.findall(text)
     if phones:
         contact['phones'] = list(set([p.strip() for p in phones]))[:3]
     if 'instagram' in text.lower() or '@' in text:
@@ -268,6 +494,9 @@ ICE_BREAKER_HEADER_RE = re.compile(
     r'^\s*(?:\d+\s*[\).:-]\s*)?(?:ice[\s\-]*breaker|icebreaker)\b.*$',
     flags=re.IGNORECASE | re.MULTILINE
 )
+BULLET_PREFIX_RE = re.compile(r'^[\-\*\u2022]\s*')
+TITLE_LINE_RE = re.compile(r'^TITLE:\s*(.+)$', flags=re.MULTILINE)
+US_PHONE_RE = re.compile(r'\d{3}[-.\s]?\d{3}[-.\s]?\d{4}')
 
 def extract_ice_breaker(full_text: str) -> str:
     """Extract ice breaker from AI response"""
@@ -278,7 +507,7 @@ def extract_ice_breaker(full_text: str) -> str:
             cleaned = line.strip()
             if not cleaned:
                 continue
-            cleaned = re.sub(r'^[\-\*\u2022]\s*', '', cleaned).strip()
+            cleaned = BULLET_PREFIX_RE.sub('', cleaned).strip()
             if cleaned and len(cleaned) > 12:
                 if not cleaned.endswith(('.', '!', '?')):
                     cleaned += '.'
@@ -298,7 +527,7 @@ def extract_ice_breaker(full_text: str) -> str:
 
 def generate_site_ice_breaker(restaurant_name: str, cleaned_html: str, preview_url: str) -> str:
     """Generate fallback ice breaker for websites (ULTRA-SOLID)"""
-    title_match = re.search(r'^TITLE:\s*(.+)$', cleaned_html, flags=re.MULTILINE)
+    title_match = TITLE_LINE_RE.search(cleaned_html)
     title = title_match.group(1).strip() if title_match else restaurant_name
     
     if len(title) > 50:
@@ -306,7 +535,7 @@ def generate_site_ice_breaker(restaurant_name: str, cleaned_html: str, preview_u
     
     # Check for missing contact info
     has_email = '@' in cleaned_html or 'email' in cleaned_html.lower()
-    has_phone = bool(re.search(r'\d{3}[-.\s]?\d{3}[-.\s]?\d{4}', cleaned_html))
+    has_phone = bool(US_PHONE_RE.search(cleaned_html))
     
     if not has_email and not has_phone:
         specific_issue = "your site is missing contact info"
@@ -331,18 +560,212 @@ def generate_fallback_ice_breaker(restaurant_name: str, preview_url: str) -> str
         f"Can I show you how to launch in 24 hours?"
     )
 
+# ============================================================================
+# 🧠 SINGLE-CALL ANALYSIS
+# ============================================================================
+# Static instructions travel as Ollama's system prompt, so every lead shares
+# the same prompt prefix and only the business name + page text vary
+ANALYSIS_SYSTEM_PROMPT = """You analyze small-business websites.
+Respond with a JSON object with exactly these string keys:
+
+"flaw_analysis":
+   KEY INFORMATION (3-4 bullet points):
+   - What the business does
+   - Contact info found/missing
+   - Main issues
+   FIX CHECKLIST (5-7 actionable items):
+   - Missing contact details, broken UX, SEO issues
+
+"builder_prompt":
+   A 3-5 sentence brief for rebuilding this site that covers every item
+   in the fix checklist.
+
+"ice_breaker" (1-2 sentences, URGENT TONE):
+   - Write as if you already know them.
+   - Imply urgent risk (losing customers, competitors winning).
+   - Reference something SPECIFIC from their site.
+   - Make it personal and time-sensitive.
+"""
+
+def build_analysis_prompt(restaurant_name: str, cleaned_html: str) -> str:
+    """Build the per-lead part of the analysis prompt"""
+    return f"""Analyze the website for "{restaurant_name}".
+
+WEBSITE DATA:
+{cleaned_html}
+"""
+
+def _as_text(value) -> str:
+    """Flatten a JSON field the model may return as a list or object"""
+    if isinstance(value, list):
+        return '\n'.join(_as_text(v) for v in value)
+    if isinstance(value, dict):
+        return '\n'.join(f"{k}: {_as_text(v)}" for k, v in value.items())
+    return str(value or '').strip()
+
+def parse_analysis_json(full_response: str) -> Optional[Dict[str, str]]:
+    """Fields of a JSON analysis reply; None unless it is an object with a flaw_analysis"""
+    try:
+        data = orjson.loads(full_response)
+    except orjson.JSONDecodeError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    
+    fields = {
+        'flaw_analysis': _as_text(data.get('flaw_analysis')),
+        'builder_prompt': _as_text(data.get('builder_prompt')),
+        'ice_breaker': _as_text(data.get('ice_breaker')),
+    }
+    return fields if fields['flaw_analysis'] else None
+
+def parse_analysis_response(full_response: str) -> Dict[str, str]:
+    """Parse the single-call JSON response, falling back to text extraction"""
+    fields = parse_analysis_json(full_response)
+    if fields is not None:
+        return fields
+    
+    # Model ignored JSON mode or the expected keys - treat it as the old free-text format
+    flaw_analysis = full_response.strip()
+    match = ICE_BREAKER_HEADER_RE.search(flaw_analysis)
+    if match:
+        flaw_analysis = flaw_analysis[:match.start()].strip()
+    return {
+        'flaw_analysis': flaw_analysis,
+        'builder_prompt': '',
+        'ice_breaker': extract_ice_breaker(full_response),
+    }
+
 # ============================================================================
 # 🔗 ASCII SLUGGING (GPT-5 SUGGESTION)
 # ============================================================================
+SLUG_SEPARATOR_RE = re.compile(r'[^a-z0-9]+')
+
 def slug_ascii(text: str) -> str:
     """Convert to ASCII-safe slug"""
     normalized = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
-    return re.sub(r'[^a-z0-9]+', '-', normalized.lower()).strip('-')
+    return SLUG_SEPARATOR_RE.sub('-', normalized.lower()).strip('-')
 
 # ============================================================================
 # 🛡️ SAFE SHEET OPERATIONS
 # ============================================================================
-def safe_sheet_read(operation, operation_name, cache_key=None, max_retries=MAX_RETRIES):
+class TokenBucket:
+    """Blocks only when the request budget is actually exhausted"""
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate  # tokens per second
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last = time.monotonic()
+    
+    def take(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+        if self.tokens < 1:
+            time.sleep((1 - self.tokens) / self.rate)
+            self.tokens = 1
+            self.last = time.monotonic()
+        self.tokens -= 1
+
+WRITE_BUCKET = TokenBucket(SHEETS_WRITES_PER_MINUTE / 60, SHEETS_WRITE_BURST)
+READ_BUCKET = TokenBucket(SHEETS_READS_PER_MINUTE / 60, SHEETS_READ_BURST)
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+def api_error_status(e: gspread.exceptions.APIError) -> Optional[int]:
+    response = getattr(e, 'response', None)
+    return getattr(response, 'status_code', None)
+
+def backoff_delay(attempt: int) -> float:
+    """Gentle exponential backoff with up to 50% jitter, never above MAX_BACKOFF"""
+    wait_time = BASE_BACKOFF * (BACKOFF_GROWTH ** attempt) * (1 + random.uniform(0, BACKOFF_JITTER))
+    return round(min(MAX_BACKOFF, wait_time), 1)
+
+RETRY_DELAY_RE = re.compile(r'^(\d+(?:\.\d+)?)s$')
+
+def retry_after_seconds(e: gspread.exceptions.APIError) -> Optional[float]:
+    """Server-requested delay from a Retry-After header or a google.rpc.RetryInfo detail"""
+    response = getattr(e, 'response', None)
+    header = getattr(response, 'headers', {}).get('Retry-After', '')
+    if header.isdigit():
+        return float(header)
+    
+    error = getattr(e, 'error', None)
+    if not isinstance(error, dict):
+        try:
+            error = response.json().get('error', {})
+        except Exception:
+            return None
+    
+    for detail in error.get('details', []):
+        if str(detail.get('@type', '')).endswith('google.rpc.RetryInfo'):
+            match = RETRY_DELAY_RE.match(str(detail.get('retryDelay', '')))
+            if match:
+                return float(match.group(1))
+    return None
+
+def _wait_before_retry(e: gspread.exceptions.APIError, attempt: int, max_retries: int,
+                       supervisor: str, operation_name: str):
+    """Back off on quota/server errors; re-raise errors a retry cannot fix"""
+    status = api_error_status(e)
+    if status is not None and status not in RETRYABLE_STATUS_CODES:
+        LOGGER.log(supervisor, "error", TaskStatus.FAILED, f"{operation_name}: {e}")
+        raise e
+    
+    if attempt == max_retries - 1:
+        return
+    
+    server_delay = retry_after_seconds(e)
+    wait_time = min(server_delay, MAX_RETRY_AFTER) if server_delay else backoff_delay(attempt)
+    phase = "rate_limit" if status == 429 else "server_error"
+    LOGGER.log(supervisor, phase, TaskStatus.RETRY_NEEDED,
+               f"{operation_name}: HTTP {status}. Waiting {wait_time}s")
+    time.sleep(wait_time)
+
+class CircuitOpenError(Exception):
+    pass
+
+class CircuitBreaker:
+    """Fail fast once a service keeps failing instead of grinding through retries.
+    
+    CLOSED -> OPEN after `threshold` failures within `window` seconds; after
+    `cooldown` seconds the next call is let through as a probe (HALF-OPEN) and
+    either closes the circuit or re-opens it.
+    """
+    
+    def __init__(self, name: str, threshold: int, window: float, cooldown: float):
+        self.name = name
+        self.threshold = threshold
+        self.window = window
+        self.cooldown = cooldown
+        self.failures: List[float] = []
+        self.opened_at: Optional[float] = None
+    
+    def check(self, operation_name: str):
+        if self.opened_at is not None and time.monotonic() - self.opened_at < self.cooldown:
+            raise CircuitOpenError(f"{operation_name}: {self.name} circuit open")
+    
+    def record_success(self):
+        self.failures = []
+        if self.opened_at is not None:
+            self.opened_at = None
+            LOGGER.log(self.name, "circuit_closed", TaskStatus.SUCCESS, "Service recovered")
+    
+    def record_failure(self):
+        now = time.monotonic()
+        self.failures = [t for t in self.failures if now - t < self.window] + [now]
+        if self.opened_at is not None or len(self.failures) >= self.threshold:
+            self.opened_at = now
+            self.failures = []
+            LOGGER.log(self.name, "circuit_open", TaskStatus.CATASTROPHIC,
+                       f"Failing fast for {self.cooldown}s")
+
+SHEETS_BREAKER = CircuitBreaker("SheetsCircuit", CIRCUIT_FAILURE_THRESHOLD,
+                                CIRCUIT_FAILURE_WINDOW, CIRCUIT_COOLDOWN)
+
+def safe_sheet_read(operation, operation_name, cache_key=None, cache_deps=(),
+                    max_retries=MAX_RETRIES):
     """Safe read with caching"""
     if cache_key:
         cached = cache.get(cache_key)
@@ -350,101 +773,254 @@ def safe_sheet_read(operation, operation_name, cache_key=None, max_retries=MAX_R
             return cached
     
     for attempt in range(max_retries):
+        SHEETS_BREAKER.check(operation_name)
         try:
+            READ_BUCKET.take()
             result = operation()
+            SHEETS_BREAKER.record_success()
             if cache_key:
-                cache.set(cache_key, result)
-            time.sleep(2)
+                cache.set(cache_key, result, cache_deps)
             return result
         except gspread.exceptions.APIError as e:
-            if '429' in str(e):
-                wait_time = (2 ** attempt) * BASE_BACKOFF
-                LOGGER.log("SheetReader", "rate_limit", TaskStatus.RETRY_NEEDED,
-                          f"Rate limit hit. Waiting {wait_time}s")
-                time.sleep(wait_time)
-            else:
-                time.sleep(BASE_BACKOFF)
+            _wait_before_retry(e, attempt, max_retries, "SheetReader", operation_name)
         except Exception as e:
             LOGGER.log("SheetReader", "error", TaskStatus.FAILED, f"{operation_name}: {e}")
             time.sleep(BASE_BACKOFF)
     
+    # One failure per exhausted call, so retries inside a call keep their full budget
+    SHEETS_BREAKER.record_failure()
     raise Exception(f"Failed {operation_name} after {max_retries} attempts")
 
-def safe_sheet_write(operation, operation_name, max_retries=MAX_RETRIES):
-    """Safe write with retries"""
+def safe_sheet_write(operation, operation_name, invalidates=(), max_retries=MAX_RETRIES):
+    """Safe write with retries; drops only the cached reads the write affects"""
     for attempt in range(max_retries):
+        SHEETS_BREAKER.check(operation_name)
         try:
+            WRITE_BUCKET.take()
             result = operation()
-            time.sleep(SHEET_UPDATE_DELAY)
-            cache.cache = {}
-            cache.save_cache()
+            SHEETS_BREAKER.record_success()
+            cache.invalidate(*invalidates)
             return result
         except gspread.exceptions.APIError as e:
-            if '429' in str(e):
-                wait_time = (2 ** attempt) * BASE_BACKOFF
-                LOGGER.log("SheetWriter", "rate_limit", TaskStatus.RETRY_NEEDED,
-                          f"Rate limit hit. Waiting {wait_time}s")
-                time.sleep(wait_time)
-            else:
-                time.sleep(BASE_BACKOFF)
+            _wait_before_retry(e, attempt, max_retries, "SheetWriter", operation_name)
         except Exception as e:
             LOGGER.log("SheetWriter", "error", TaskStatus.FAILED, f"{operation_name}: {e}")
             time.sleep(BASE_BACKOFF)
     
+    # One failure per exhausted call, so retries inside a call keep their full budget
+    SHEETS_BREAKER.record_failure()
     raise Exception(f"Failed {operation_name} after {max_retries} attempts")
 
+def _user_entered_cell(value) -> Dict:
+    return {"userEnteredValue": {"stringValue": str(value)}}
+
+def append_row_request(worksheet, row: List[str]) -> Dict:
+    """batchUpdate request that appends one row to a worksheet"""
+    return {
+        "appendCells": {
+            "sheetId": worksheet.id,
+            "rows": [{"values": [_user_entered_cell(v) for v in row]}],
+            "fields": "userEnteredValue"
+        }
+    }
+
+def update_cell_request(worksheet, row: int, col: int, value) -> Dict:
+    """batchUpdate request that sets a single cell (1-based row/col)"""
+    return {
+        "updateCells": {
+            "range": {
+                "sheetId": worksheet.id,
+                "startRowIndex": row - 1,
+                "endRowIndex": row,
+                "startColumnIndex": col - 1,
+                "endColumnIndex": col
+            },
+            "rows": [{"values": [_user_entered_cell(value)]}],
+            "fields": "userEnteredValue"
+        }
+    }
+
+def delete_rows_requests(worksheet, row_nums: List[int]) -> List[Dict]:
+    """deleteDimension requests for the given 1-based rows.
+    
+    Consecutive rows collapse into one range, and ranges run bottom-up so
+    earlier deletions don't shift the indices of later ones.
+    """
+    runs = []
+    for row in sorted(set(row_nums), reverse=True):
+        if runs and runs[-1][0] == row + 1:
+            runs[-1][0] = row
+        else:
+            runs.append([row, row])
+    return [
+        {
+            "deleteDimension": {
+                "range": {
+                    "sheetId": worksheet.id,
+                    "dimension": "ROWS",
+                    "startIndex": start - 1,
+                    "endIndex": end
+                }
+            }
+        }
+        for start, end in runs
+    ]
+
+def submit_batch_requests(spreadsheet, requests: List[Dict], operation_name: str,
+                          invalidates=(RESULTS_DEP,)):
+    """Send batchUpdate requests in as few calls as possible"""
+    for start in range(0, len(requests), BATCH_UPDATE_CHUNK):
+        chunk = requests[start:start + BATCH_UPDATE_CHUNK]
+        # partial binds this chunk now; a lambda would read the loop variable late
+        safe_sheet_write(partial(spreadsheet.batch_update, {"requests": chunk}), operation_name,
+                         invalidates)
+
+def read_results_records(results_worksheet, operation_name: str) -> List[Dict]:
+    """Full RESULTS records, shared by every check until a RESULTS write"""
+    return safe_sheet_read(
+        lambda: records_from_values(results_worksheet.get_values()),
+        operation_name,
+        RESULTS_RECORDS_KEY,
+        (RESULTS_DEP,)
+    )
+
+class NormalizedIndex:
+    """RESULTS rows by normalized restaurant name, first row wins"""
+    
+    def __init__(self, records: List[Dict]):
+        self.rows: Dict[str, Tuple[int, Dict]] = {}
+        for idx, row in enumerate(records):
+            row_norm = NON_ALNUM_RE.sub('', str(row.get("Restaurant Name", "")).lower())
+            self.rows.setdefault(row_norm, (idx + 2, row))
+    
+    def find(self, name: str) -> Optional[Tuple[int, Dict]]:
+        """(sheet row number, record) of the first row for name"""
+        return self.rows.get(NON_ALNUM_RE.sub('', name.lower()))
+
+def read_results_index(results_worksheet, operation_name: str) -> NormalizedIndex:
+    """Name index over the RESULTS snapshot, cached with it and dropped on a RESULTS write"""
+    index = cache.get(RESULTS_NAME_INDEX_KEY)
+    if index is None:
+        index = NormalizedIndex(read_results_records(results_worksheet, operation_name))
+        cache.set(RESULTS_NAME_INDEX_KEY, index, (RESULTS_DEP,))
+    return index
+
+def records_from_values(values: List[List[str]]) -> List[Dict]:
+    """Build get_all_records-style dicts from raw values (first row = headers)"""
+    if not values:
+        return []
+    headers = values[0]
+    return [
+        dict(zip(headers, row + [""] * (len(headers) - len(row))))
+        for row in values[1:]
+    ]
+
+def _column(value_range: Dict) -> List[str]:
+    return [row[0] if row else "" for row in value_range.get("values", [])]
+
+def fetch_leads_and_results(spreadsheet) -> Tuple[List[Dict], List[Dict]]:
+    """Fetch LEADS and RESULTS in a single batchGet round-trip.
+    
+    Only the RESULTS name/phone columns are read - the duplicate check never
+    needs the long analysis/prompt columns.
+    """
+    data = safe_sheet_read(
+        partial(spreadsheet.values_batch_get, ["LEADS!A:H", "RESULTS!A:A", "RESULTS!F:F"]),
+        "Fetch leads + results",
+        None
+    )
+    value_ranges = data.get("valueRanges", [])
+    while len(value_ranges) < 3:
+        value_ranges.append({})
+    
+    leads_values = value_ranges[0].get("values", [])
+    names = _column(value_ranges[1])
+    phones = _column(value_ranges[2])
+    row_count = max(len(names), len(phones))
+    names += [""] * (row_count - len(names))
+    phones += [""] * (row_count - len(phones))
+    results_values = [list(pair) for pair in zip(names, phones)]
+    
+    return records_from_values(leads_values), records_from_values(results_values)
+
 # ============================================================================
 # 🔤 TEXT NORMALIZATION
 # ============================================================================
+NON_DIGIT_RE = re.compile(r'\D+')
+NON_ALNUM_RE = re.compile(r'[^a-z0-9]')
+NON_ALNUM_SPACE_RE = re.compile(r'[^a-z0-9\s]')
+WHITESPACE_RE = re.compile(r'\s+')
+
 def normalize_text(text):
     if not text:
         return ""
-    cleaned = re.sub(r'[^a-z0-9\s]', '', str(text).lower())
-    return ' '.join(cleaned.split())
+    cleaned = NON_ALNUM_SPACE_RE.sub('', str(text).lower())
+    return WHITESPACE_RE.sub(' ', cleaned).strip()
 
 def normalize_phone(phone):
     if not phone:
         return ""
-    digits = ''.join(filter(str.isdigit, str(phone)))
+    digits = NON_DIGIT_RE.sub('', str(phone))
     return digits[-10:] if len(digits) >= 10 else digits
 
 # ============================================================================
 # 🛡️ DUPLICATE GUARDIAN - 3-PHASE PROTECTION
 # ============================================================================
+
+@lru_cache(maxsize=8192)
+def duplicate_key(name: str, phone: str) -> Optional[str]:
+    """Phone-based key when a full number exists, else name-based (memoized -
+    the same RESULTS rows are re-keyed on every snapshot rebuild)"""
+    name_norm = NON_ALNUM_RE.sub('', name.lower())
+    phone_norm = NON_DIGIT_RE.sub('', phone)[-10:] if phone else ""
+    
+    if phone_norm and len(phone_norm) == 10:
+        return f"phone:{phone_norm}"
+    elif name_norm:
+        return f"name:{name_norm}"
+    return None
+
 class DuplicateGuardian:
     """Triple-layer duplicate prevention"""
     
     def __init__(self):
         self.registry = self._load_registry()
+        self._indexed_records = None
+        self._key_index = {}
+        self.saved_keys = set()
     
     def _load_registry(self) -> Dict:
         if os.path.exists(DUPLICATE_REGISTRY_FILE):
             try:
-                with open(DUPLICATE_REGISTRY_FILE, 'r') as f:
-                    return json.load(f)
+                with open(DUPLICATE_REGISTRY_FILE, 'rb') as f:
+                    return orjson.loads(f.read())
             except:
                 pass
         return {"keys": {}, "last_updated": None}
     
     def _save_registry(self):
         self.registry["last_updated"] = datetime.now().isoformat()
-        with open(DUPLICATE_REGISTRY_FILE, 'w') as f:
-            json.dump(self.registry, f, indent=2)
+        write_file_atomic(DUPLICATE_REGISTRY_FILE, orjson.dumps(self.registry, option=orjson.OPT_INDENT_2))
     
     def _create_duplicate_key(self, name: str, phone: str) -> str:
-        name_norm = re.sub(r'[^a-z0-9]', '', name.lower())
-        phone_norm = ''.join(filter(str.isdigit, phone))[-10:] if phone else ""
-        
-        if phone_norm and len(phone_norm) == 10:
-            key = f"phone:{phone_norm}"
-        elif name_norm:
-            key = f"name:{name_norm}"
-        else:
-            key = None
-        
-        return key
+        return duplicate_key(name, phone or "")
+    
+    def _index_for(self, results_data: List[Dict]) -> Dict[str, Tuple[str, str]]:
+        """Duplicate key -> (name, phone), rebuilt only when the snapshot changes"""
+        if results_data is not self._indexed_records:
+            index = {}
+            for row in results_data:
+                existing_name = str(row.get("Restaurant Name", "")).strip()
+                existing_phone = str(row.get("Phone Number", "")).strip()
+                existing_key = self._create_duplicate_key(existing_name, existing_phone)
+                if existing_key:
+                    index.setdefault(existing_key, (existing_name, existing_phone))
+            self._indexed_records = results_data
+            self._key_index = index
+        return self._key_index
     
-    def phase1_check_before(self, name: str, phone: str, results_worksheet) -> Tuple[bool, str]:
+    def phase1_check_before(self, name: str, phone: str, results_worksheet,
+                            results_data: Optional[List[Dict]] = None) -> Tuple[bool, str]:
         """Phase 1: Check BEFORE processing"""
         LOGGER.log("DuplicateGuardian", "phase1_start", TaskStatus.SUCCESS,
                    f"Phase 1 check for {name}")
@@ -459,27 +1035,21 @@ class DuplicateGuardian:
             return True, "registry"
         
         try:
-            results_data = safe_sheet_read(
-                lambda: results_worksheet.get_all_records(),
-                "Phase1 sheet check",
-                None
-            )
+            if results_data is None:
+                results_data = read_results_records(results_worksheet, "Phase1 sheet check")
             
-            for row in results_data:
-                existing_name = str(row.get("Restaurant Name", "")).strip()
-                existing_phone = str(row.get("Phone Number", "")).strip()
-                existing_key = self._create_duplicate_key(existing_name, existing_phone)
-                
-                if existing_key and dup_key == existing_key:
-                    LOGGER.log("DuplicateGuardian", "phase1_sheet_hit", TaskStatus.BLOCKED,
-                               f"Found in sheet: {existing_name}")
-                    self.registry["keys"][dup_key] = {
-                        "name": existing_name,
-                        "phone": existing_phone,
-                        "added": datetime.now().isoformat()
-                    }
-                    self._save_registry()
-                    return True, "sheet"
+            existing = self._index_for(results_data).get(dup_key)
+            if existing:
+                existing_name, existing_phone = existing
+                LOGGER.log("DuplicateGuardian", "phase1_sheet_hit", TaskStatus.BLOCKED,
+                           f"Found in sheet: {existing_name}")
+                self.registry["keys"][dup_key] = {
+                    "name": existing_name,
+                    "phone": existing_phone,
+                    "added": datetime.now().isoformat()
+                }
+                self._save_registry()
+                return True, "sheet"
         
         except Exception as e:
             LOGGER.log("DuplicateGuardian", "phase1_check_error", TaskStatus.FAILED,
@@ -489,40 +1059,32 @@ class DuplicateGuardian:
                    f"Phase 1 passed for {name}")
         return False, "passed"
     
-    def phase2_check_during(self, name: str, phone: str, results_worksheet) -> Tuple[bool, str]:
-        """Phase 2: Check DURING processing"""
+    def phase2_check_during(self, name: str, phone: str) -> Tuple[bool, str]:
+        """Phase 2: Check DURING processing.
+        
+        Phase 1 already checked the sheet, and this processor is the only
+        writer to RESULTS, so the only rows that can have appeared since are
+        ones saved in this session - no sheet read needed.
+        """
         LOGGER.log("DuplicateGuardian", "phase2_start", TaskStatus.SUCCESS,
                    f"Phase 2 check for {name}")
         
-        time.sleep(2)
-        
         dup_key = self._create_duplicate_key(name, phone)
         if not dup_key:
             return False, "no_key"
         
-        try:
-            results_data = safe_sheet_read(
-                lambda: results_worksheet.get_all_records(),
-                "Phase2 sheet check",
-                None
-            )
-            
-            for row in results_data:
-                existing_name = str(row.get("Restaurant Name", "")).strip()
-                existing_phone = str(row.get("Phone Number", "")).strip()
-                existing_key = self._create_duplicate_key(existing_name, existing_phone)
-                
-                if existing_key and dup_key == existing_key:
-                    LOGGER.log("DuplicateGuardian", "phase2_duplicate", TaskStatus.BLOCKED,
-                               f"Duplicate detected: {existing_name}")
-                    return True, "concurrent"
-            
-            return False, "passed"
-            
-        except Exception as e:
-            LOGGER.log("DuplicateGuardian", "phase2_error", TaskStatus.FAILED,
-                       f"Phase 2 check failed: {e}")
-            return False, "error"
+        if dup_key in self.saved_keys or dup_key in self.registry["keys"]:
+            LOGGER.log("DuplicateGuardian", "phase2_duplicate", TaskStatus.BLOCKED,
+                       f"Duplicate detected: {name}")
+            return True, "concurrent"
+        
+        return False, "passed"
+    
+    def record_saved(self, name: str, phone: str):
+        """Remember a row this process appended"""
+        dup_key = self._create_duplicate_key(name, phone)
+        if dup_key:
+            self.saved_keys.add(dup_key)
     
     def phase3_verify_after(self, name: str, phone: str, results_worksheet) -> Tuple[bool, str]:
         """Phase 3: Verify AFTER save"""
@@ -536,11 +1098,7 @@ class DuplicateGuardian:
             return True, "no_key"
         
         try:
-            results_data = safe_sheet_read(
-                lambda: results_worksheet.get_all_records(),
-                "Phase3 sheet check",
-                None
-            )
+            results_data = read_results_records(results_worksheet, "Phase3 sheet check")
             
             matches = []
             for idx, row in enumerate(results_data):
@@ -571,15 +1129,18 @@ class DuplicateGuardian:
                 LOGGER.log("DuplicateGuardian", "phase3_duplicates_found", TaskStatus.CATASTROPHIC,
                            f"Found {len(matches)} duplicates!")
                 
-                for row_num, _, _ in matches[1:]:
-                    try:
-                        results_worksheet.delete_rows(row_num)
-                        LOGGER.log("DuplicateGuardian", "phase3_cleanup", TaskStatus.SUCCESS,
-                                   f"Deleted duplicate at row {row_num}")
-                        time.sleep(2)
-                    except Exception as e:
-                        LOGGER.log("DuplicateGuardian", "phase3_cleanup_failed", TaskStatus.FAILED,
-                                   f"Failed to delete row {row_num}: {e}")
+                duplicate_rows = [row_num for row_num, _, _ in matches[1:]]
+                try:
+                    submit_batch_requests(
+                        results_worksheet.spreadsheet,
+                        delete_rows_requests(results_worksheet, duplicate_rows),
+                        "Phase3 duplicate cleanup"
+                    )
+                    LOGGER.log("DuplicateGuardian", "phase3_cleanup", TaskStatus.SUCCESS,
+                               f"Deleted duplicates at rows {duplicate_rows}")
+                except Exception as e:
+                    LOGGER.log("DuplicateGuardian", "phase3_cleanup_failed", TaskStatus.FAILED,
+                               f"Failed to delete rows {duplicate_rows}: {e}")
                 
                 return True, "cleaned"
         
@@ -598,19 +1159,20 @@ class PhoneSyncGuardian:
         self.phone_map = {}
     
     def _normalize_name(self, name: str) -> str:
-        return re.sub(r'[^a-z0-9]', '', name.lower())
+        return NON_ALNUM_RE.sub('', name.lower())
     
-    def phase1_build_map(self, leads_worksheet):
+    def phase1_build_map(self, leads_worksheet, leads_data: Optional[List[Dict]] = None):
         """Phase 1: Build phone map"""
         LOGGER.log("PhoneSyncGuardian", "phase1_start", TaskStatus.SUCCESS,
                    "Building phone map")
         
         try:
-            leads_data = safe_sheet_read(
-                lambda: leads_worksheet.get_all_records(),
-                "Phase1 build phone map",
-                None
-            )
+            if leads_data is None:
+                leads_data = safe_sheet_read(
+                    lambda: records_from_values(leads_worksheet.get_values()),
+                    "Phase1 build phone map",
+                    None
+                )
             
             self.phone_map = {}
             for lead in leads_data:
@@ -651,35 +1213,31 @@ class PhoneSyncGuardian:
         time.sleep(2)
         
         try:
-            results_data = safe_sheet_read(
-                lambda: results_worksheet.get_all_records(),
-                "Phase3 phone verify",
-                None
-            )
+            match = read_results_index(results_worksheet, "Phase3 phone verify").find(name)
+            if match is None:
+                return False
             
-            for idx, row in enumerate(results_data):
-                row_name = str(row.get("Restaurant Name", "")).strip()
-                
-                if self._normalize_name(row_name) == self._normalize_name(name):
-                    saved_phone = str(row.get("Phone Number", "")).strip()
-                    
-                    if saved_phone == expected_phone:
-                        LOGGER.log("PhoneSyncGuardian", "phase3_verified", TaskStatus.SUCCESS,
-                                   f"Phone verified: {saved_phone}")
-                        return True
-                    else:
-                        row_num = idx + 2
-                        try:
-                            results_worksheet.update_cell(row_num, 6, expected_phone)
-                            LOGGER.log("PhoneSyncGuardian", "phase3_fixed", TaskStatus.FALLBACK_USED,
-                                       f"Fixed phone at row {row_num}")
-                            return True
-                        except Exception as e:
-                            LOGGER.log("PhoneSyncGuardian", "phase3_fix_failed", TaskStatus.CATASTROPHIC,
-                                       f"Failed to fix: {e}")
-                            return False
+            row_num, row = match
+            saved_phone = str(row.get("Phone Number", "")).strip()
             
-            return False
+            if saved_phone == expected_phone:
+                LOGGER.log("PhoneSyncGuardian", "phase3_verified", TaskStatus.SUCCESS,
+                           f"Phone verified: {saved_phone}")
+                return True
+            
+            try:
+                submit_batch_requests(
+                    results_worksheet.spreadsheet,
+                    [update_cell_request(results_worksheet, row_num, 6, expected_phone)],
+                    "Phase3 phone fix"
+                )
+                LOGGER.log("PhoneSyncGuardian", "phase3_fixed", TaskStatus.FALLBACK_USED,
+                           f"Fixed phone at row {row_num}")
+                return True
+            except Exception as e:
+                LOGGER.log("PhoneSyncGuardian", "phase3_fix_failed", TaskStatus.CATASTROPHIC,
+                           f"Failed to fix: {e}")
+                return False
             
         except Exception as e:
             LOGGER.log("PhoneSyncGuardian", "phase3_error", TaskStatus.FAILED,
@@ -738,45 +1296,40 @@ class PreviewURLGuardian:
         time.sleep(2)
         
         try:
-            results_data = safe_sheet_read(
-                lambda: results_worksheet.get_all_records(),
-                "Phase3 URL verify",
-                None
-            )
+            match = read_results_index(results_worksheet, "Phase3 URL verify").find(name)
+            if match is None:
+                return False
             
-            for idx, row in enumerate(results_data):
-                row_name = str(row.get("Restaurant Name", "")).strip()
-                
-                if re.sub(r'[^a-z0-9]', '', row_name.lower()) == re.sub(r'[^a-z0-9]', '', name.lower()):
-                    preview_url_col = str(row.get("Preview URL", "")).strip()
-                    ice_breaker = str(row.get("Ice_Breaker", "")).strip()
-                    
-                    url_in_column = expected_url in preview_url_col
-                    url_in_icebreaker = expected_url in ice_breaker
-                    
-                    if url_in_column and url_in_icebreaker:
-                        LOGGER.log("PreviewURLGuardian", "phase3_verified", TaskStatus.SUCCESS,
-                                   "URL verified in both locations")
-                        return True
-                    else:
-                        row_num = idx + 2
-                        try:
-                            if not url_in_column:
-                                results_worksheet.update_cell(row_num, 5, expected_url)
-                            
-                            if not url_in_icebreaker:
-                                fixed_ice = self.phase2_embed_in_icebreaker(ice_breaker, expected_url)
-                                results_worksheet.update_cell(row_num, 16, fixed_ice)
-                            
-                            LOGGER.log("PreviewURLGuardian", "phase3_fixed", TaskStatus.FALLBACK_USED,
-                                       "Fixed URL placement")
-                            return True
-                        except Exception as e:
-                            LOGGER.log("PreviewURLGuardian", "phase3_fix_failed", TaskStatus.CATASTROPHIC,
-                                       f"Failed to fix: {e}")
-                            return False
+            row_num, row = match
+            preview_url_col = str(row.get("Preview URL", "")).strip()
+            ice_breaker = str(row.get("Ice_Breaker", "")).strip()
             
-            return False
+            url_in_column = expected_url in preview_url_col
+            url_in_icebreaker = expected_url in ice_breaker
+            
+            if url_in_column and url_in_icebreaker:
+                LOGGER.log("PreviewURLGuardian", "phase3_verified", TaskStatus.SUCCESS,
+                           "URL verified in both locations")
+                return True
+            
+            try:
+                fixes = []
+                if not url_in_column:
+                    fixes.append(update_cell_request(results_worksheet, row_num, 5, expected_url))
+                
+                if not url_in_icebreaker:
+                    fixed_ice = self.phase2_embed_in_icebreaker(ice_breaker, expected_url)
+                    fixes.append(update_cell_request(results_worksheet, row_num, 16, fixed_ice))
+                
+                submit_batch_requests(results_worksheet.spreadsheet, fixes, "Phase3 URL fix")
+                
+                LOGGER.log("PreviewURLGuardian", "phase3_fixed", TaskStatus.FALLBACK_USED,
+                           "Fixed URL placement")
+                return True
+            except Exception as e:
+                LOGGER.log("PreviewURLGuardian", "phase3_fix_failed", TaskStatus.CATASTROPHIC,
+                           f"Failed to fix: {e}")
+                return False
             
         except Exception as e:
             LOGGER.log("PreviewURLGuardian", "phase3_error", TaskStatus.FAILED,
@@ -823,33 +1376,26 @@ class DataIntegrityGuardian:
         time.sleep(2)
         
         try:
-            results_data = safe_sheet_read(
-                lambda: results_worksheet.get_all_records(),
-                "Column integrity verify",
-                None
-            )
+            match = read_results_index(results_worksheet, "Column integrity verify").find(name)
+            if match is None:
+                return False
             
-            for idx, row in enumerate(results_data):
-                if re.sub(r'[^a-z0-9]', '', str(row.get("Restaurant Name", "")).lower()) == \
-                   re.sub(r'[^a-z0-9]', '', name.lower()):
-                    
-                    checks = {
-                        "Restaurant Name": row.get("Restaurant Name") == expected_data.restaurant_name,
-                        "Preview URL": row.get("Preview URL") == expected_data.preview_url,
-                        "Phone Number": row.get("Phone Number") == expected_data.phone,
-                        "Ice Breaker": expected_data.preview_url in str(row.get("Ice_Breaker", ""))
-                    }
-                    
-                    if all(checks.values()):
-                        LOGGER.log("DataIntegrityGuardian", "columns_verified", TaskStatus.SUCCESS,
-                                   "All columns correct")
-                        return True
-                    else:
-                        failed = [k for k, v in checks.items() if not v]
-                        LOGGER.log("DataIntegrityGuardian", "column_mismatch", TaskStatus.FAILED,
-                                   f"Issues: {', '.join(failed)}")
-                        return False
+            _, row = match
+            checks = {
+                "Restaurant Name": row.get("Restaurant Name") == expected_data.restaurant_name,
+                "Preview URL": row.get("Preview URL") == expected_data.preview_url,
+                "Phone Number": row.get("Phone Number") == expected_data.phone,
+                "Ice Breaker": expected_data.preview_url in str(row.get("Ice_Breaker", ""))
+            }
             
+            if all(checks.values()):
+                LOGGER.log("DataIntegrityGuardian", "columns_verified", TaskStatus.SUCCESS,
+                           "All columns correct")
+                return True
+            
+            failed = [k for k, v in checks.items() if not v]
+            LOGGER.log("DataIntegrityGuardian", "column_mismatch", TaskStatus.FAILED,
+                       f"Issues: {', '.join(failed)}")
             return False
             
         except Exception as e:
@@ -908,8 +1454,8 @@ class SystemHealthGuardian:
         
         self.health_data["last_check"] = datetime.now().isoformat()
         
-        with open(HEALTH_CHECK_FILE, 'w') as f:
-            json.dump(self.health_data, f, indent=2)
+        with open(HEALTH_CHECK_FILE, 'wb') as f:
+            f.write(orjson.dumps(self.health_data, option=orjson.OPT_INDENT_2))
         
         return self.health_data
 
@@ -962,8 +1508,8 @@ class BackupGuardian:
                 f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{slug_ascii(lead_data.restaurant_name)}.json"
             )
             
-            with open(backup_file, 'w') as f:
-                json.dump({
+            with open(backup_file, 'wb') as f:
+                f.write(orjson.dumps({
                     "timestamp": datetime.now().isoformat(),
                     "data": {
                         "restaurant_name": lead_data.restaurant_name,
@@ -973,7 +1519,7 @@ class BackupGuardian:
                         "preview_url": lead_data.preview_url,
                         "ice_breaker": lead_data.ice_breaker
                     }
-                }, f, indent=2)
+                }, option=orjson.OPT_INDENT_2))
             
             LOGGER.log("BackupGuardian", "backup_saved", TaskStatus.SUCCESS,
                        f"Backed up: {backup_file}")
@@ -1067,7 +1613,7 @@ class RestManager:
         print(f"⏰ Resting for {self.rest_duration / 60:.1f} minutes")
         print(f"{'='*70}\n")
         
-        time.sleep(self.rest_duration)
+        SHUTDOWN.wait(self.rest_duration)
         
         self.leads_since_rest = 0
         
@@ -1078,6 +1624,178 @@ class RestManager:
     def increment(self):
         self.leads_since_rest += 1
 
+# ============================================================================
+# 🌐 BROWSER MANAGER
+# ============================================================================
+BODY_RE = re.compile(r'<body[^>]*>(.*)</body>', flags=re.IGNORECASE | re.DOTALL)
+
+HEAD_RE = re.compile(r'<head\b[^>]*>.*?</head>', flags=re.IGNORECASE | re.DOTALL)
+
+# Drop the tags clean_html_aggressive would throw away before the body
+# crosses back from the browser; of the head only the title and meta
+# description are kept
+STRIPPED_PAGE_JS = """() => {
+    const head = document.createElement('head');
+    const title = document.createElement('title');
+    title.textContent = document.title;
+    head.appendChild(title);
+    const desc = document.querySelector('meta[name="description"]');
+    if (desc) head.appendChild(desc.cloneNode());
+    const body = document.body.cloneNode(true);
+    body.querySelectorAll('script,style,noscript,svg,iframe,template,canvas,object,embed,picture')
+        .forEach(el => el.remove());
+    return head.outerHTML + body.outerHTML;
+}"""
+
+META_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([\w.:-]+)', flags=re.IGNORECASE)
+
+def decode_html(response: requests.Response) -> str:
+    """Decode a page body, trusting the HTTP charset, then <meta charset>, then detection.
+    
+    requests falls back to ISO-8859-1 for text/html without a charset, which
+    mangles the UTF-8 most small sites actually serve.
+    """
+    if 'charset' in response.headers.get('Content-Type', '').lower():
+        return response.text
+    
+    meta = META_CHARSET_RE.search(response.content[:4096])
+    encoding = meta.group(1).decode('ascii') if meta else response.apparent_encoding
+    try:
+        return response.content.decode(encoding or 'utf-8', errors='replace')
+    except LookupError:
+        return response.content.decode('utf-8', errors='replace')
+
+def fetch_static_page(url: str) -> Optional[str]:
+    """Fetch a page's head + body without a browser; None if it needs JavaScript to render"""
+    try:
+        response = requests.get(url, timeout=STATIC_FETCH_TIMEOUT,
+                                headers={"User-Agent": SCRAPER_USER_AGENT})
+    except requests.exceptions.RequestException:
+        return None
+    
+    if response.status_code != 200 or 'html' not in response.headers.get('Content-Type', ''):
+        return None
+    
+    html = decode_html(response)
+    if any(marker in html for marker in SPA_MARKERS):
+        return None
+    
+    match = BODY_RE.search(html)
+    if not match:
+        return html if len(html) >= MIN_HTML_LENGTH else None
+    if len(match.group(1)) < MIN_HTML_LENGTH:
+        return None
+    # Keep the head so the cleaner can read the title and meta description
+    head = HEAD_RE.search(html, 0, match.start())
+    return (head.group(0) if head else '') + match.group(0)
+
+def has_website(target_url: str) -> bool:
+    return bool(target_url) and target_url.lower() not in ["no website found", "", "n/a"]
+
+class BrowserManager:
+    """Keeps one Chromium instance alive across leads.
+    
+    Playwright's async API runs on a private event loop thread, so up to
+    SCRAPE_CONCURRENCY pages of one shared context load in parallel while
+    the main thread analyzes the current lead.
+    """
+    
+    def __init__(self, concurrency: int = SCRAPE_CONCURRENCY):
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.launch_lock = asyncio.Lock()
+        self.prefetched: Dict[str, Future] = {}
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="playwright", daemon=True)
+        self.thread.start()
+    
+    def _submit(self, coro) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+    
+    async def _ensure_context(self):
+        async with self.launch_lock:
+            if self.browser is not None and self.browser.is_connected():
+                return self.context
+            
+            if self.playwright is None:
+                self.playwright = await async_playwright().start()
+            self.browser = await self.playwright.chromium.launch(headless=True)
+            self.context = await self.browser.new_context(user_agent=SCRAPER_USER_AGENT)
+            # Only text reaches the analysis, so skip images/fonts/media/CSS
+            await self.context.route("**/*", self._block_heavy_resources)
+            LOGGER.log("BrowserManager", "browser_launched", TaskStatus.SUCCESS,
+                       "Launched shared Chromium instance")
+            return self.context
+    
+    @staticmethod
+    async def _block_heavy_resources(route):
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+    
+    async def _scrape_page(self, url: str) -> str:
+        # Plain HTML sites don't need a browser at all
+        page_html = await asyncio.to_thread(fetch_static_page, url)
+        if page_html is not None:
+            return page_html
+        
+        async with self.semaphore:
+            context = await self._ensure_context()
+            page = await context.new_page()
+            try:
+                await page.goto(url, timeout=PAGE_LOAD_TIMEOUT_MS, wait_until="domcontentloaded")
+                try:
+                    await page.wait_for_load_state("load", timeout=PAGE_SETTLE_TIMEOUT_MS)
+                except PlaywrightTimeoutError:
+                    pass
+                # A script that never yields would otherwise block evaluate forever
+                return await asyncio.wait_for(page.evaluate(STRIPPED_PAGE_JS),
+                                              PAGE_LOAD_TIMEOUT_MS / 1000)
+            finally:
+                await page.close()
+    
+    def prefetch(self, url: str):
+        """Start loading url in the background"""
+        if url not in self.prefetched:
+            self.prefetched[url] = self._submit(self._scrape_page(url))
+    
+    def clear_prefetched(self):
+        for future in self.prefetched.values():
+            future.cancel()
+        self.prefetched = {}
+    
+    def scrape_page(self, url: str) -> str:
+        """Return the stripped HTML of url, using a prefetched load if one exists"""
+        future = self.prefetched.pop(url, None) or self._submit(self._scrape_page(url))
+        try:
+            return future.result(timeout=SCRAPE_TIMEOUT)
+        except FutureTimeoutError:
+            future.cancel()
+            raise Exception(f"Scrape timed out after {SCRAPE_TIMEOUT}s")
+    
+    async def _close(self):
+        try:
+            if self.browser is not None:
+                await self.browser.close()
+            if self.playwright is not None:
+                await self.playwright.stop()
+        except Exception as e:
+            LOGGER.log("BrowserManager", "close_failed", TaskStatus.FAILED,
+                       f"Browser shutdown failed: {e}")
+        finally:
+            self.context = None
+            self.browser = None
+            self.playwright = None
+    
+    def close(self):
+        self.clear_prefetched()
+        self._submit(self._close()).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
 # ============================================================================
 # 🎯 MASTER ORCHESTRATOR (WITH FULL ANALYSIS FLOW)
 # ============================================================================
@@ -1094,20 +1812,35 @@ class MasterOrchestrator:
         self.backup_guardian = BackupGuardian()
         self.progress_tracker = ProgressTracker(daily_goal)
         self.rest_manager = RestManager(REST_AFTER_LEADS, REST_DURATION)
+        self.browser_manager = BrowserManager()
         
         self.leads_worksheet = leads_worksheet
         self.results_worksheet = results_worksheet
         
-        self.phone_guardian.phase1_build_map(leads_worksheet)
         self.health_guardian.check_health()
     
-    def process_lead_fully_supervised(self, lead: Dict, lead_row_index: int) -> bool:
+    def _mark_failed(self, lead_row_index: int, status: str):
+        """Record a terminal failure so the lead isn't picked up again every pass"""
+        try:
+            safe_sheet_write(
+                partial(self.leads_worksheet.update_cell, lead_row_index, 6, status),
+                "Mark failed",
+                (LEADS_DEP,)
+            )
+        except:
+            pass
+    
+    def process_lead_fully_supervised(self, lead: Dict, lead_row_index: int,
+                                      results_data: Optional[List[Dict]] = None) -> bool:
         """Process a lead with COMPLETE supervision + FULL ANALYSIS"""
         
         restaurant_name = str(lead.get("Restaurant Name", "")).strip()
         phone_raw = str(lead.get("Phone Number", "")).strip()
         target_url = lead.get("Website URL", "").strip()
         
+        # Don't scrape + analyze a lead that can't be saved while Sheets is down
+        SHEETS_BREAKER.check(f"Lead {restaurant_name}")
+        
         LOGGER.log("MasterOrchestrator", "lead_start", TaskStatus.SUCCESS,
                    f"🎯 STARTING: {restaurant_name}")
         
@@ -1116,13 +1849,14 @@ class MasterOrchestrator:
         
         # Duplicate check Phase 1
         is_dup, reason = self.duplicate_guardian.phase1_check_before(
-            restaurant_name, phone_raw, self.results_worksheet
+            restaurant_name, phone_raw, self.results_worksheet, results_data
         )
         
         if is_dup:
             safe_sheet_write(
-                lambda: self.leads_worksheet.update_cell(lead_row_index, 6, "Complete - Duplicate"),
-                "Mark duplicate"
+                partial(self.leads_worksheet.update_cell, lead_row_index, 6, "Complete - Duplicate"),
+                "Mark duplicate",
+                (LEADS_DEP,)
             )
             self.progress_tracker.update(success=False, duplicate=True)
             return False
@@ -1133,21 +1867,11 @@ class MasterOrchestrator:
         # Generate preview URL
         preview_url = self.preview_guardian.phase1_generate(restaurant_name)
         
-        # Mark processing
-        try:
-            safe_sheet_write(
-                lambda: self.leads_worksheet.update_cell(lead_row_index, 6, 
-                                                        f"Processing... {datetime.now().strftime('%H:%M:%S')}"),
-                "Mark processing"
-            )
-        except:
-            pass
-        
         # ═══════════════════════════════════════════════════════════════
         # FULL ANALYSIS FLOW (GPT-5 VERSION)
         # ═══════════════════════════════════════════════════════════════
         
-        if not target_url or target_url.lower() in ["no website found", "", "n/a"]:
+        if not has_website(target_url):
             # NO WEBSITE PATH
             LOGGER.log("MasterOrchestrator", "no_website", TaskStatus.SUCCESS,
                        "Taking no-website path")
@@ -1162,19 +1886,19 @@ class MasterOrchestrator:
                        f"Scraping {target_url}")
             
             try:
-                # Scrape with Playwright
-                with sync_playwright() as p:
-                    browser = p.chromium.launch(headless=True)
-                    page = browser.new_page()
-                    try:
-                        page.goto(target_url, timeout=60000)
-                        body_html = page.locator("body").inner_html()
-                        LOGGER.log("MasterOrchestrator", "scraping_success", TaskStatus.SUCCESS,
-                                   f"Scraped {len(body_html)} chars")
-                    finally:
-                        browser.close()
+                cleaned_html = page_store.get(target_url)
                 
-                cleaned_html = clean_html_aggressive(body_html)
+                if cleaned_html is not None:
+                    LOGGER.log("MasterOrchestrator", "scraping_skipped", TaskStatus.SUCCESS,
+                               "Reusing stored page content")
+                else:
+                    # Scrape with the shared Playwright browser
+                    page_html = self.browser_manager.scrape_page(target_url)
+                    LOGGER.log("MasterOrchestrator", "scraping_success", TaskStatus.SUCCESS,
+                               f"Scraped {len(page_html)} chars")
+                    
+                    cleaned_html = clean_html_aggressive(page_html)
+                    page_store.put(target_url, cleaned_html)
                 
             except Exception as e:
                 LOGGER.log("MasterOrchestrator", "scraping_failed", TaskStatus.FAILED,
@@ -1184,52 +1908,29 @@ class MasterOrchestrator:
             # AI Analysis
             try:
                 if cleaned_html:
-                    prompt = f"""Analyze the website for "{restaurant_name}" and provide:
-
-1. KEY INFORMATION (3-4 bullet points):
-   - What the business does
-   - Contact info found/missing
-   - Main issues
-
-2. FIX CHECKLIST (5-7 actionable items):
-   - Missing contact details, broken UX, SEO issues
-
-3. ICE BREAKER (1-2 sentences, URGENT TONE):
-   - Write as if you already know them.
-   - Imply urgent risk (losing customers, competitors winning).
-   - Reference something SPECIFIC from their site.
-   - Make it personal and time-sensitive.
-
-WEBSITE DATA:
-{cleaned_html}
-"""
+                    prompt = build_analysis_prompt(restaurant_name, cleaned_html)
                     
                     LOGGER.log("MasterOrchestrator", "ollama_start", TaskStatus.SUCCESS,
                                "Calling Ollama for analysis")
                     
-                    full_response = ask_ollama(prompt, max_tokens=900, temperature=0.3)
-                    
-                    # Extract flaw analysis (everything before ice breaker)
-                    flaw_analysis = full_response.strip()
+                    full_response = ask_ollama_cached(prompt, max_tokens=1200, temperature=0.3,
+                                                      json_mode=True, system=ANALYSIS_SYSTEM_PROMPT,
+                                                      validate=parse_analysis_json)
+                    analysis = parse_analysis_response(full_response)
                     
-                    # Extract ice breaker
-                    ice_breaker_extracted = extract_ice_breaker(full_response)
+                    flaw_analysis = analysis['flaw_analysis']
                     
-                    if ice_breaker_extracted:
-                        ice_breaker = ice_breaker_extracted
+                    if analysis['ice_breaker']:
+                        ice_breaker = analysis['ice_breaker']
                         LOGGER.log("MasterOrchestrator", "ice_breaker_extracted", TaskStatus.SUCCESS,
                                    "Extracted ice breaker from AI")
-                        
-                        # Remove ice breaker from flaw analysis
-                        if ICE_BREAKER_HEADER_RE.search(flaw_analysis):
-                            match = ICE_BREAKER_HEADER_RE.search(flaw_analysis)
-                            flaw_analysis = flaw_analysis[:match.start()].strip()
                     else:
                         ice_breaker = generate_site_ice_breaker(restaurant_name, cleaned_html, preview_url)
                         LOGGER.log("MasterOrchestrator", "ice_breaker_fallback", TaskStatus.FALLBACK_USED,
                                    "Using fallback ice breaker")
                     
-                    builder_prompt = "Fix critical issues: contact info, mobile UX, SEO, speed"
+                    builder_prompt = (analysis['builder_prompt'] or
+                                      "Fix critical issues: contact info, mobile UX, SEO, speed")
                     
                 else:
                     # Scrape failed but website exists
@@ -1266,6 +1967,7 @@ WEBSITE DATA:
         # Validate
         valid, issues = self.data_guardian.validate_row_structure(lead_data)
         if not valid:
+            self._mark_failed(lead_row_index, "Failed - Invalid Data")
             self.progress_tracker.update(success=False)
             return False
         
@@ -1273,27 +1975,32 @@ WEBSITE DATA:
         self.backup_guardian.backup_lead_data(lead_data)
         
         # Duplicate check Phase 2
-        is_dup, reason = self.duplicate_guardian.phase2_check_during(
-            restaurant_name, correct_phone, self.results_worksheet
-        )
+        is_dup, reason = self.duplicate_guardian.phase2_check_during(restaurant_name, correct_phone)
         
         if is_dup:
             safe_sheet_write(
-                lambda: self.leads_worksheet.update_cell(lead_row_index, 6, "Complete - Duplicate"),
-                "Mark duplicate"
+                partial(self.leads_worksheet.update_cell, lead_row_index, 6, "Complete - Duplicate"),
+                "Mark duplicate",
+                (LEADS_DEP,)
             )
             self.progress_tracker.update(success=False, duplicate=True)
             return False
         
-        # Save
+        # Save result row + mark lead complete in one batchUpdate
         try:
             safe_sheet_write(
-                lambda: self.results_worksheet.append_row(lead_data.to_sheet_row()),
-                "Save lead data"
+                lambda: self.results_worksheet.spreadsheet.batch_update({"requests": [
+                    append_row_request(self.results_worksheet, lead_data.to_sheet_row()),
+                    update_cell_request(self.leads_worksheet, lead_row_index, 6, "Complete")
+                ]}),
+                "Save lead data",
+                (RESULTS_DEP, LEADS_DEP)
             )
+            self.duplicate_guardian.record_saved(restaurant_name, correct_phone)
         except Exception as e:
             LOGGER.log("MasterOrchestrator", "save_failed", TaskStatus.CATASTROPHIC,
                        f"Save failed: {e}")
+            self._mark_failed(lead_row_index, "Failed - Save Error")
             self.progress_tracker.update(success=False)
             return False
         
@@ -1320,15 +2027,18 @@ WEBSITE DATA:
             LOGGER.log("MasterOrchestrator", "lead_complete", TaskStatus.SUCCESS,
                        f"✅ FULLY VERIFIED: {restaurant_name}")
             
-            safe_sheet_write(
-                lambda: self.leads_worksheet.update_cell(lead_row_index, 6, "Complete"),
-                "Mark complete"
-            )
-            
             self.progress_tracker.update(success=True)
             self.rest_manager.increment()
             return True
         else:
+            try:
+                safe_sheet_write(
+                    partial(self.leads_worksheet.update_cell, lead_row_index, 6, "Complete - Unverified"),
+                    "Mark unverified",
+                    (LEADS_DEP,)
+                )
+            except:
+                pass
             self.progress_tracker.update(success=False)
             return False
 
@@ -1362,49 +2072,68 @@ def main():
     
     orchestrator = MasterOrchestrator(MAX_LEADS_PER_DAY, leads_worksheet, results_worksheet)
     
-    while True:
+    try:
+        run_loop(orchestrator)
+    finally:
+        orchestrator.browser_manager.close()
+
+def run_loop(orchestrator: MasterOrchestrator):
+    """Process pending leads until interrupted"""
+    while not SHUTDOWN.is_set():
         try:
-            if orchestrator.rest_manager.should_rest():
-                orchestrator.rest_manager.take_rest()
-                orchestrator.health_guardian.check_health()
+            # One snapshot per pass; only re-read once every pending lead is handled
+            all_leads, results_data = fetch_leads_and_results(spreadsheet)
+            orchestrator.phone_guardian.phase1_build_map(orchestrator.leads_worksheet, all_leads)
             
-            all_leads = safe_sheet_read(
-                lambda: leads_worksheet.get_all_records(),
-                "Fetch leads",
-                None
-            )
+            pending_leads = [
+                (idx + 2, lead) for idx, lead in enumerate(all_leads)
+                if str(lead.get("Status", "")).strip().lower() == "pending"
+            ]
             
-            processed_this_cycle = False
+            if not pending_leads:
+                print("ℹ️  No pending leads. Waiting...")
+                SHUTDOWN.wait(RETRY_DELAY_SECONDS)
+                continue
             
-            for idx, lead in enumerate(all_leads):
-                status = str(lead.get("Status", "")).strip().lower()
-                
-                if status == "pending":
-                    lead_row_index = idx + 2
+            try:
+                for position, (lead_row_index, lead) in enumerate(pending_leads):
+                    if SHUTDOWN.is_set():
+                        break
+                    
+                    if orchestrator.rest_manager.should_rest():
+                        orchestrator.rest_manager.take_rest()
+                        orchestrator.health_guardian.check_health()
+                    
+                    # Queue this lead's site first so it never waits behind the
+                    # prefetches, then load upcoming sites while it is analyzed
+                    upcoming = pending_leads[position:position + 1 + SCRAPE_CONCURRENCY]
+                    for _, next_lead in upcoming:
+                        next_url = str(next_lead.get("Website URL", "")).strip()
+                        if has_website(next_url) and page_store.get(next_url) is None:
+                            orchestrator.browser_manager.prefetch(next_url)
                     
                     success = orchestrator.process_lead_fully_supervised(
-                        lead, lead_row_index
+                        lead, lead_row_index, results_data
                     )
                     
-                    processed_this_cycle = True
-                    
                     if success:
                         delay = random.randint(MIN_DELAY_SECONDS, MAX_DELAY_SECONDS)
                         print(f"⏸️  Waiting {delay}s...\n")
-                        time.sleep(delay)
-                    
-                    break
-            
-            if not processed_this_cycle:
-                print("ℹ️  No pending leads. Waiting...")
-                time.sleep(RETRY_DELAY_SECONDS)
+                        SHUTDOWN.wait(delay)
+            finally:
+                # Don't leave loads running against the semaphore after an error or shutdown
+                orchestrator.browser_manager.clear_prefetched()
                 
         except KeyboardInterrupt:
             print("\n⛔ Stopped by user")
             break
+        except CircuitOpenError as e:
+            LOGGER.log("MainLoop", "circuit_open", TaskStatus.BLOCKED,
+                       f"{e}. Pausing {RETRY_DELAY_SECONDS}s")
+            SHUTDOWN.wait(RETRY_DELAY_SECONDS)
         except Exception as e:
             LOGGER.log("MainLoop", "error", TaskStatus.CATASTROPHIC, f"Error: {e}")
-            time.sleep(RETRY_DELAY_SECONDS)
+            SHUTDOWN.wait(RETRY_DELAY_SECONDS)
 
 if __name__ == "__main__":
     try:
@@ -1419,4 +2148,5 @@ if __name__ == "__main__":
         print(f"❌ FATAL: {e}")
         exit(1)
     
+    signal.signal(signal.SIGTERM, lambda signum, frame: SHUTDOWN.set())
     main()